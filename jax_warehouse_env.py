@@ -0,0 +1,216 @@
+"""
+Pure-function JAX port of SimpleWarehouseEnv for batched rollouts.
+
+State is an EnvState pytree and reset/step have no side effects, so
+jax.vmap steps a whole batch of envs and jax.jit fuses each batched step
+into one XLA kernel (CPU or GPU). Same actions, observation and rewards as
+SimpleWarehouseEnv; rendering stays with SimpleWarehouseEnv.
+
+    state, obs = reset_batch(key, num_envs=4096)
+    state, obs, reward, terminated, truncated = step_batch(state, actions, key)
+
+rollout runs a policy for a fixed number of batched steps in one
+lax.scan; sweep vmaps rollout over independent seeds.
+
+GymnaxWarehouseEnv wraps the same functions in the gymnax reset/step
+signatures for PureJaxRL-style training loops.
+"""
+
+from collections import namedtuple
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+
+from _step_kernel import DX, DY, PICKUP, DROP
+
+
+EnvState = namedtuple('EnvState', 'agent pickup dest holding step')
+
+# (dx, dy) per action, the same table the single env uses
+_DXDY = jnp.array(list(zip(DX, DY)), dtype=jnp.int32)
+
+
+def get_observation(state):
+    """[agent_x, agent_y, pickup_x, pickup_y, dest_x, dest_y, holding] as float32"""
+    return jnp.concatenate([
+        state.agent, state.pickup, state.dest, state.holding[None]
+    ]).astype(jnp.float32)
+
+
+def reset(key, grid_size=5):
+    """New episode for one env: agent, pickup and destination on distinct cells"""
+    # Sampling without replacement, so no rejection loop is needed
+    cells = jax.random.choice(key, grid_size * grid_size, shape=(3,), replace=False)
+    xy = jnp.stack([cells % grid_size, cells // grid_size], axis=-1).astype(jnp.int32)
+    state = EnvState(
+        agent=xy[0], pickup=xy[1], dest=xy[2],
+        holding=jnp.array(False), step=jnp.array(0, dtype=jnp.int32)
+    )
+    return state, get_observation(state)
+
+
+def step(state, action, grid_size=5):
+    """
+    Apply one action to one env.
+    Returns (state, obs, reward, terminated, truncated).
+    """
+    # Current target: the pickup until the item is held, then the destination
+    target = jnp.where(state.holding, state.dest, state.pickup)
+    old_d2 = jnp.sum((state.agent - target) ** 2)
+    on_target = jnp.all(state.agent == target)
+
+    # Movement: table lookup plus clamp (pickup/drop have a zero delta)
+    agent = jnp.clip(state.agent + _DXDY[action], 0, grid_size - 1)
+
+    # Pickup / drop
+    picked = (action == PICKUP) & ~state.holding & on_target
+    dropping = (action == DROP) & state.holding
+    delivered = dropping & on_target
+    holding = state.holding | picked
+
+    # A pickup switches the target to the destination; the agent did not move
+    target = jnp.where(holding, state.dest, state.pickup)
+    old_d2 = jnp.where(picked, jnp.sum((state.agent - target) ** 2), old_d2)
+    new_d2 = jnp.sum((agent - target) ** 2)
+
+    reward = (
+        -0.02  # Penalty per step
+        + jnp.where(picked, 50.0, 0.0)
+        + jnp.where(delivered, 300.0, jnp.where(dropping, -10.0, 0.0))
+        + jnp.where(new_d2 < old_d2, 2.0, jnp.where(new_d2 < 2.25, 1.0, 0.0))
+    )
+
+    state = EnvState(agent, state.pickup, state.dest, holding, state.step + 1)
+    return state, get_observation(state), reward, delivered, state.step > 200
+
+
+@partial(jax.jit, static_argnames=('num_envs', 'grid_size'))
+def reset_batch(key, num_envs, grid_size=5):
+    """Reset num_envs envs; every leaf of the returned state has a leading batch dim"""
+    keys = jax.random.split(key, num_envs)
+    return jax.vmap(partial(reset, grid_size=grid_size))(keys)
+
+
+@partial(jax.jit, static_argnames=('grid_size',))
+def step_batch(state, actions, key, grid_size=5):
+    """
+    Step a batch of envs and auto-reset the finished ones with fresh layouts
+    drawn from key. Returns (state, obs, reward, terminated, truncated); obs of
+    finished envs is already the first observation of their next episode.
+    """
+    state, obs, reward, terminated, truncated = jax.vmap(
+        partial(step, grid_size=grid_size)
+    )(state, actions)
+
+    done = terminated | truncated
+    fresh_state, fresh_obs = reset_batch(key, actions.shape[0], grid_size)
+
+    def select(fresh, old):
+        return jnp.where(done.reshape(done.shape + (1,) * (old.ndim - 1)), fresh, old)
+
+    state = jax.tree_util.tree_map(select, fresh_state, state)
+    obs = select(fresh_obs, obs)
+    return state, obs, reward, terminated, truncated
+
+
+@partial(jax.jit, static_argnames=('policy', 'num_envs', 'horizon', 'grid_size'))
+def rollout(key, policy, num_envs=64, horizon=201, grid_size=5):
+    """
+    Run policy(obs, key) -> actions on num_envs auto-resetting envs for horizon
+    steps (201 = one full episode) as a single lax.scan.
+    Returns (reward, terminated, truncated), each of shape (horizon, num_envs).
+    policy is a static jit argument, hashed by identity: reuse one function
+    object across calls. Every new lambda or closure (e.g. one per update of
+    the network params) compiles the whole scan again.
+    """
+    key, reset_key = jax.random.split(key)
+    state, obs = reset_batch(reset_key, num_envs, grid_size)
+
+    def body(carry, key):
+        state, obs = carry
+        policy_key, reset_key = jax.random.split(key)
+        actions = policy(obs, policy_key)
+        state, obs, reward, terminated, truncated = step_batch(state, actions, reset_key, grid_size)
+        return (state, obs), (reward, terminated, truncated)
+
+    _, out = jax.lax.scan(body, (state, obs), jax.random.split(key, horizon))
+    return out
+
+
+def sweep(key, policy, num_seeds, **kwargs):
+    """rollout for num_seeds independent seeds at once; outputs gain a leading seed dim"""
+    keys = jax.random.split(key, num_seeds)
+    return jax.vmap(lambda k: rollout(k, policy, **kwargs))(keys)
+
+
+class Discrete:
+    """gymnax-style discrete space: actions 0 .. n-1"""
+    
+    def __init__(self, n):
+        self.n = n
+        self.shape = ()
+        self.dtype = jnp.int32
+    
+    def sample(self, key):
+        return jax.random.randint(key, self.shape, 0, self.n, dtype=self.dtype)
+    
+    def contains(self, x):
+        return jnp.logical_and(x >= 0, x < self.n)
+
+
+class Box:
+    """gymnax-style box space with scalar bounds"""
+    
+    def __init__(self, low, high, shape, dtype=jnp.float32):
+        self.low = low
+        self.high = high
+        self.shape = shape
+        self.dtype = dtype
+    
+    def sample(self, key):
+        return jax.random.uniform(key, self.shape, minval=self.low, maxval=self.high).astype(self.dtype)
+    
+    def contains(self, x):
+        return jnp.all(jnp.logical_and(x >= self.low, x <= self.high))
+
+
+class GymnaxWarehouseEnv:
+    """
+    gymnax-style interface: reset(key, params) -> (obs, state),
+    step(key, state, action, params) -> (obs, state, reward, done, info) for
+    a single env with auto-reset, and action_space(params) /
+    observation_space(params). Methods are pure, so callers jit and vmap
+    them. grid_size fixes array shapes and is therefore not an env param.
+    """
+    
+    def __init__(self, grid_size=5):
+        self.grid_size = grid_size
+    
+    @property
+    def default_params(self):
+        return None  # No runtime parameters
+    
+    @property
+    def num_actions(self):
+        return 6
+    
+    def action_space(self, params=None):
+        return Discrete(6)
+    
+    def observation_space(self, params=None):
+        # Same bounds as SimpleWarehouseEnv.observation_space
+        return Box(0, self.grid_size, (7,), jnp.float32)
+    
+    def reset(self, key, params=None):
+        state, obs = reset(key, self.grid_size)
+        return obs, state
+    
+    def step(self, key, state, action, params=None):
+        state, obs, reward, terminated, truncated = step(state, action, self.grid_size)
+        done = terminated | truncated
+        fresh_state, fresh_obs = reset(key, self.grid_size)
+        state = jax.tree_util.tree_map(lambda fresh, old: jnp.where(done, fresh, old),
+                                       fresh_state, state)
+        obs = jnp.where(done, fresh_obs, obs)
+        return obs, state, reward, done, {'terminated': terminated, 'truncated': truncated}
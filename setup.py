@@ -0,0 +1,12 @@
+"""
+Builds the optional Cython step kernel (CySimpleWarehouseEnv).
+Run: python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="warehouse-delivery-rl",
+    ext_modules=cythonize("simple_warehouse_env_cy.pyx"),
+)
@@ -1,7 +1,43 @@
-import gym
-from gym import spaces
+import sys
+
+import gymnasium as gym
+from gymnasium import spaces
 import numpy as np
-import pygame
+
+from _step_kernel import DX, DY, UP, DOWN, LEFT, RIGHT, PICKUP, DROP, step_core
+
+
+def _noop():
+    pass
+
+
+# pygame and its fonts are shared by every env in the process. pygame is
+# imported on the first render, so training without rendering never loads it.
+pygame = None
+_PYGAME_USERS = 0  # Envs that have a display open
+_FONTS = {}
+
+
+def _ensure_pygame():
+    """Register one more rendering env; the first one imports and initializes pygame and the fonts"""
+    global pygame, _PYGAME_USERS
+    if pygame is None:
+        import pygame
+    if _PYGAME_USERS == 0:
+        pygame.init()
+        _FONTS['L'] = pygame.font.Font(None, 32)
+        _FONTS['M'] = pygame.font.Font(None, 24)
+        _FONTS['S'] = pygame.font.Font(None, 20)
+    _PYGAME_USERS += 1
+
+
+def _quit_pygame():
+    """Unregister a rendering env; pygame shuts down when the last one closes"""
+    global _PYGAME_USERS
+    _PYGAME_USERS -= 1
+    if _PYGAME_USERS == 0:
+        pygame.quit()
+        _FONTS.clear()
 
 
 class SimpleWarehouseEnv(gym.Env):
@@ -13,15 +49,38 @@ class SimpleWarehouseEnv(gym.Env):
     Observation: [agent_x, agent_y, pickup_x, pickup_y, dest_x, dest_y, holding_item]
     """
     
-    metadata = {'render_modes': ['human']}
+    metadata = {'render_modes': ['human'], 'render_fps': 2}
+    
+    # Grid delta per action, shared with the step kernel
+    _DX = DX
+    _DY = DY
     
-    def __init__(self, grid_size=5, render_mode=None):
+    # Number of start layouts drawn per RNG call
+    _LAYOUT_BATCH = 1024
+    
+    # Compiled step kernel; subclasses can swap in another implementation
+    _step_core = staticmethod(step_core)
+    
+    def __init__(self, grid_size=5, render_mode=None, zero_terminal_obs=False):
         super(SimpleWarehouseEnv, self).__init__()
         
         self.grid_size = grid_size
         self.render_mode = render_mode
+        # Return a shared all-zero observation on delivery instead of building
+        # one; only for learners that never read the terminated observation.
+        # The same array is returned on every such step, so it is read-only.
+        self.zero_terminal_obs = zero_terminal_obs
         self.cell_size = 60
         
+        # Pixel geometry, fixed for the env's lifetime
+        self._grid_px = grid_size * self.cell_size
+        self._half_cell = self.cell_size // 2
+        
+        # Resolve the per-step render hook once instead of checking every step
+        self._maybe_render = self.render if render_mode == 'human' else _noop
+        # Frame-rate cap for human rendering; 0 renders as fast as steps arrive
+        self.fps = self.metadata['render_fps']
+        
         # Actions: 0=up, 1=down, 2=left, 3=right, 4=pickup, 5=drop
         self.action_space = spaces.Discrete(6)
         self.action_names = ["UP ↑", "DOWN ↓", "LEFT ←", "RIGHT →", "PICK", "DROP"]
@@ -34,113 +93,149 @@ class SimpleWarehouseEnv(gym.Env):
         
         self.screen = None
         self.clock = None
+        self._bg_surface = None
+        self._bg_dirty = True
         self.step_count = 0
         self.last_action = None
         self.last_reward = 0
         self.holding_item = False
         
+        # Observation is filled in place, then handed out as a copy
+        self._obs_buf = np.empty(7, dtype=np.float32)
+        self._zero_obs = np.zeros(7, dtype=np.float32)
+        self._zero_obs.flags.writeable = False
+        
+        # Compile (or load from cache) the step kernel now, not on the first step;
+        # the dummy arguments have the same types as the real ones
+        self._step_core(0, 0, 0, 0, 1, 1, False, 0, grid_size)
+        
+        self._layouts = []
+        self._layout_idx = 0
         self.reset()
     
-    def reset(self):
+    def _refill_layouts(self):
+        """Draw a batch of start layouts (agent, pickup, destination) in one go"""
+        cells = self.np_random.integers(0, self.grid_size * self.grid_size, size=(self._LAYOUT_BATCH, 3))
+        # Keep only rows with three distinct cells; the survivors are uniform
+        distinct = ((cells[:, 0] != cells[:, 1]) & (cells[:, 0] != cells[:, 2])
+                    & (cells[:, 1] != cells[:, 2]))
+        y, x = np.divmod(cells[distinct], self.grid_size)
+        self._layouts = np.stack(
+            [x[:, 0], y[:, 0], x[:, 1], y[:, 1], x[:, 2], y[:, 2]], axis=1
+        ).tolist()
+        self._layout_idx = 0
+    
+    def reset(self, *, seed=None, options=None):
         """Reset environment with new random positions"""
-        # Agent starts at random position
-        self.agent_pos = np.array([
-            np.random.randint(0, self.grid_size),
-            np.random.randint(0, self.grid_size)
-        ], dtype=np.float32)
-        
-        # Pickup point (random)
-        self.pickup_pos = np.array([
-            np.random.randint(0, self.grid_size),
-            np.random.randint(0, self.grid_size)
-        ], dtype=np.float32)
-        
-        # Destination (random, different from pickup)
-        while True:
-            self.dest_pos = np.array([
-                np.random.randint(0, self.grid_size),
-                np.random.randint(0, self.grid_size)
-            ], dtype=np.float32)
-            if not np.array_equal(self.dest_pos, self.pickup_pos):
-                break
+        super(SimpleWarehouseEnv, self).reset(seed=seed)
+        if seed is not None:
+            # Layouts drawn from the old generator would ignore the new seed
+            self._layouts = []
+            self._layout_idx = 0
+        
+        # Agent, pickup and destination on three distinct cells, taken from a
+        # pre-drawn batch so most resets make no RNG call at all
+        while self._layout_idx >= len(self._layouts):
+            self._refill_layouts()
+        (self.agent_x, self.agent_y,
+         self.pickup_x, self.pickup_y,
+         self.dest_x, self.dest_y) = self._layouts[self._layout_idx]
+        self._layout_idx += 1
         
         self.holding_item = False
         self.step_count = 0
-        return self._get_observation()
+        self._bg_dirty = True  # Markers moved
+        return self._get_observation(), {}
     
     def _get_observation(self):
-        """Return current state"""
-        return np.array([
-            self.agent_pos[0],
-            self.agent_pos[1],
-            self.pickup_pos[0],
-            self.pickup_pos[1],
-            self.dest_pos[0],
-            self.dest_pos[1],
-            float(self.holding_item)
-        ], dtype=np.float32)
+        """Return current state, writing every field of the observation buffer"""
+        b = self._obs_buf
+        b[0] = self.agent_x
+        b[1] = self.agent_y
+        b[2] = self.pickup_x
+        b[3] = self.pickup_y
+        b[4] = self.dest_x
+        b[5] = self.dest_y
+        b[6] = self.holding_item
+        # Copy so observations already handed out are not overwritten next step
+        return b.copy()
+    
+    def _update_observation(self):
+        """Return current state, rewriting only the fields a step can change"""
+        # Pickup and destination are fixed for the episode; reset() wrote them
+        b = self._obs_buf
+        b[0] = self.agent_x
+        b[1] = self.agent_y
+        b[6] = self.holding_item
+        return b.copy()
     
     def step(self, action):
         """Execute one action"""
         self.step_count += 1
         self.last_action = int(action)
-        reward = -0.02  # Penalty per step
-        done = False
-        
-        # Calculate distances BEFORE movement
-        old_dist_to_pickup = np.linalg.norm(self.agent_pos - self.pickup_pos)
-        old_dist_to_dest = np.linalg.norm(self.agent_pos - self.dest_pos)
-        
-        # Movement actions (0-3)
-        if action == 0:  # up
-            self.agent_pos[1] = max(0, self.agent_pos[1] - 1)
-        elif action == 1:  # down
-            self.agent_pos[1] = min(self.grid_size - 1, self.agent_pos[1] + 1)
-        elif action == 2:  # left
-            self.agent_pos[0] = max(0, self.agent_pos[0] - 1)
-        elif action == 3:  # right
-            self.agent_pos[0] = min(self.grid_size - 1, self.agent_pos[0] + 1)
         
-        # Pickup action
-        elif action == 4:
-            if np.linalg.norm(self.agent_pos - self.pickup_pos) < 0.5 and not self.holding_item:
-                self.holding_item = True
-                reward += 50  # Good reward for pickup
-        
-        # Drop action
-        elif action == 5:
-            if self.holding_item and np.linalg.norm(self.agent_pos - self.dest_pos) < 0.5:
-                reward += 300  # BIG reward for success!
-                done = True
-            elif self.holding_item:
-                reward -= 10  # Penalty for wrong drop
-        
-        # Reward shaping based on progress
-        if not self.holding_item:
-            # Agent hasn't picked up yet - reward for moving towards pickup
-            new_dist_to_pickup = np.linalg.norm(self.agent_pos - self.pickup_pos)
-            if new_dist_to_pickup < old_dist_to_pickup:
-                reward += 2  # Strong reward for moving closer to pickup
-            elif new_dist_to_pickup < 1.5:
-                reward += 1  # Bonus when very close
-        else:
-            # Agent is holding item - reward for moving towards destination
-            new_dist_to_dest = np.linalg.norm(self.agent_pos - self.dest_pos)
-            if new_dist_to_dest < old_dist_to_dest:
-                reward += 2  # Strong reward for moving closer to destination
-            elif new_dist_to_dest < 1.5:
-                reward += 1  # Bonus when very close
+        # Movement, pickup/drop and reward shaping run in the compiled kernel
+        (self.agent_x, self.agent_y, self.holding_item,
+         reward, terminated) = self._step_core(
+            self.agent_x, self.agent_y,
+            self.pickup_x, self.pickup_y,
+            self.dest_x, self.dest_y,
+            self.holding_item, self.last_action, self.grid_size
+        )
         
         self.last_reward = reward
         
         # Increased timeout - allow up to 200 steps for 5x5 grid
-        if self.step_count > 200:
-            done = True
+        truncated = self.step_count > 200
         
-        if self.render_mode == 'human':
-            self.render()
+        self._maybe_render()
         
-        return self._get_observation(), reward, done, {}
+        if terminated and self.zero_terminal_obs:
+            return self._zero_obs, reward, terminated, truncated, {}
+        return self._update_observation(), reward, terminated, truncated, {}
+    
+    @staticmethod
+    def _make_sprite(outer_color, inner_color, outer_radius, inner_radius, letter=None):
+        """Two nested circles (plus optional letter) on a transparent 44x44 surface"""
+        sprite = pygame.Surface((44, 44), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, outer_color, (22, 22), outer_radius)
+        pygame.draw.circle(sprite, inner_color, (22, 22), inner_radius)
+        if letter is not None:
+            sprite.blit(letter, (22 - 8, 22 - 8))
+        # Match the display pixel format so per-frame blits need no conversion
+        return sprite.convert_alpha()
+    
+    def _build_background(self):
+        """Draw the per-episode static layer: background, grid, pickup and destination"""
+        if self._bg_surface is None:
+            self._bg_surface = pygame.Surface(self.screen.get_size()).convert()
+        bg = self._bg_surface
+        
+        # Clear
+        bg.fill((240, 240, 240))
+        
+        # Draw grid
+        bg.blit(self._grid_surface, (0, 0))
+        
+        # Draw pickup point (BLUE)
+        pickup_x = self.pickup_x * self.cell_size + self._half_cell
+        pickup_y = self.pickup_y * self.cell_size + self._half_cell
+        bg.blit(self._pickup_sprite, (pickup_x - 22, pickup_y - 22))
+        
+        # Draw destination (GREEN)
+        dest_x = self.dest_x * self.cell_size + self._half_cell
+        dest_y = self.dest_y * self.cell_size + self._half_cell
+        bg.blit(self._dest_sprite, (dest_x - 22, dest_y - 22))
+        
+        self._bg_dirty = False
+    
+    def _txt(self, text, color):
+        """Panel text rendered with self.font, cached by (text, color)"""
+        key = (text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            surf = self._text_cache[key] = self.font.render(text, True, color)
+        return surf
     
     def render(self):
         """Visualize environment"""
@@ -148,90 +243,307 @@ class SimpleWarehouseEnv(gym.Env):
             return
         
         if self.screen is None:
-            pygame.init()
+            _ensure_pygame()
             self.screen = pygame.display.set_mode(
-                (self.grid_size * self.cell_size + 200, self.grid_size * self.cell_size + 50)
+                (self._grid_px + 200, self._grid_px + 50)
             )
             self.clock = pygame.time.Clock()
             pygame.display.set_caption("Warehouse Delivery RL")
-            self.font_large = pygame.font.Font(None, 32)
-            self.font = pygame.font.Font(None, 24)
-            self.font_small = pygame.font.Font(None, 20)
-        
-        # Clear
-        self.screen.fill((240, 240, 240))
-        
-        # Draw grid
-        grid_px = self.grid_size * self.cell_size
-        pygame.draw.rect(self.screen, (255, 255, 255), (0, 0, grid_px, grid_px))
-        
-        for i in range(self.grid_size + 1):
-            pygame.draw.line(self.screen, (200, 200, 200),
-                           (i * self.cell_size, 0),
-                           (i * self.cell_size, grid_px), 1)
-            pygame.draw.line(self.screen, (200, 200, 200),
-                           (0, i * self.cell_size),
-                           (grid_px, i * self.cell_size), 1)
-        
-        # Draw pickup point (BLUE)
-        pickup_x = int(self.pickup_pos[0] * self.cell_size + self.cell_size // 2)
-        pickup_y = int(self.pickup_pos[1] * self.cell_size + self.cell_size // 2)
-        pygame.draw.circle(self.screen, (50, 100, 200), (pickup_x, pickup_y), 18)
-        pygame.draw.circle(self.screen, (100, 150, 255), (pickup_x, pickup_y), 14)
-        self.screen.blit(self.font.render("P", True, (255, 255, 255)), (pickup_x - 8, pickup_y - 8))
-        
-        # Draw destination (GREEN)
-        dest_x = int(self.dest_pos[0] * self.cell_size + self.cell_size // 2)
-        dest_y = int(self.dest_pos[1] * self.cell_size + self.cell_size // 2)
-        pygame.draw.circle(self.screen, (50, 200, 50), (dest_x, dest_y), 18)
-        pygame.draw.circle(self.screen, (100, 255, 100), (dest_x, dest_y), 14)
-        self.screen.blit(self.font.render("D", True, (255, 255, 255)), (dest_x - 8, dest_y - 8))
+            self.font_large = _FONTS['L']
+            self.font = _FONTS['M']
+            self.font_small = _FONTS['S']
+            
+            # The grid never changes: build it once as a pixel array (white
+            # cells, a gray line every cell_size pixels) and blit it every frame
+            grid_rgb = np.full((self._grid_px + 1, self._grid_px + 1, 3), 255, dtype=np.uint8)
+            grid_rgb[::self.cell_size] = 200
+            grid_rgb[:, ::self.cell_size] = 200
+            self._grid_surface = pygame.surfarray.make_surface(grid_rgb).convert()
+            
+            # Markers only move, so each one is pre-rendered as a 44x44 sprite
+            self._pickup_sprite = self._make_sprite(
+                (50, 100, 200), (100, 150, 255), 18, 14,
+                self.font.render("P", True, (255, 255, 255)))
+            self._dest_sprite = self._make_sprite(
+                (50, 200, 50), (100, 255, 100), 18, 14,
+                self.font.render("D", True, (255, 255, 255)))
+            self._agent_sprite = self._make_sprite((200, 50, 50), (255, 100, 100), 20, 15)
+            
+            # Info panel: static label and the lines with a fixed set of values
+            # (one per action, one per holding state) are rendered once
+            self._label_stepinfo = self.font_large.render("Step Info", True, (50, 50, 50))
+            self._action_surfs = [self.font.render(f"Action: {name}", True, (0, 0, 200))
+                                  for name in self.action_names]
+            self._status_surfs = [self.font_small.render(f"Status: {status}", True, (100, 100, 0))
+                                  for status in ("EMPTY", "HOLDING")]
+            # Step and reward lines come from a small set of strings; each one
+            # is rendered the first time it is shown
+            self._text_cache = {}
+        
+        # Background, grid and both markers are static within an episode
+        if self._bg_dirty:
+            self._build_background()
+        self.screen.blit(self._bg_surface, (0, 0))
         
         # Draw agent (RED)
-        agent_x = int(self.agent_pos[0] * self.cell_size + self.cell_size // 2)
-        agent_y = int(self.agent_pos[1] * self.cell_size + self.cell_size // 2)
-        pygame.draw.circle(self.screen, (200, 50, 50), (agent_x, agent_y), 20)
-        pygame.draw.circle(self.screen, (255, 100, 100), (agent_x, agent_y), 15)
+        agent_x = self.agent_x * self.cell_size + self._half_cell
+        agent_y = self.agent_y * self.cell_size + self._half_cell
+        self.screen.blit(self._agent_sprite, (agent_x - 22, agent_y - 22))
         
         # If holding item, draw a box around agent
         if self.holding_item:
             pygame.draw.rect(self.screen, (255, 200, 0), (agent_x - 22, agent_y - 22, 44, 44), 3)
         
         # Draw movement arrow
-        if self.last_action is not None and self.last_action < 4:
-            colors = {0: (0, 100, 255), 1: (255, 150, 0), 2: (255, 0, 150), 3: (0, 255, 150)}
-            dx = [0, 0, -25, 25]
-            dy = [-25, 25, 0, 0]
+        if self.last_action is not None and self.last_action < PICKUP:
+            colors = {UP: (0, 100, 255), DOWN: (255, 150, 0), LEFT: (255, 0, 150), RIGHT: (0, 255, 150)}
             
-            arrow_x = agent_x + dx[self.last_action]
-            arrow_y = agent_y + dy[self.last_action]
+            arrow_x = agent_x + 25 * self._DX[self.last_action]
+            arrow_y = agent_y + 25 * self._DY[self.last_action]
             pygame.draw.line(self.screen, colors[self.last_action], 
                            (agent_x, agent_y), (arrow_x, arrow_y), 4)
             pygame.draw.circle(self.screen, colors[self.last_action], (arrow_x, arrow_y), 8)
         
         # Draw info panel
-        info_x = grid_px + 20
+        info_x = self._grid_px + 20
         info_y = 20
         
-        self.screen.blit(self.font_large.render("Step Info", True, (50, 50, 50)), (info_x, info_y))
-        self.screen.blit(self.font.render(f"Step: {self.step_count}", True, (50, 50, 50)), 
-                        (info_x, info_y + 40))
+        self.screen.blit(self._label_stepinfo, (info_x, info_y))
+        
+        self.screen.blit(self._txt(f"Step: {self.step_count}", (50, 50, 50)), (info_x, info_y + 40))
         
         if self.last_action is not None:
-            self.screen.blit(self.font.render(f"Action: {self.action_names[self.last_action]}", 
-                                             True, (0, 0, 200)), (info_x, info_y + 70))
+            self.screen.blit(self._action_surfs[self.last_action], (info_x, info_y + 70))
         
-        status = "HOLDING" if self.holding_item else "EMPTY"
-        self.screen.blit(self.font_small.render(f"Status: {status}", True, (100, 100, 0)),
-                        (info_x, info_y + 100))
+        self.screen.blit(self._status_surfs[self.holding_item], (info_x, info_y + 100))
         
         reward_color = (0, 150, 0) if self.last_reward > 0 else (150, 0, 0)
-        self.screen.blit(self.font.render(f"Reward: {self.last_reward:+.2f}", True, reward_color),
-                        (info_x, info_y + 130))
+        self.screen.blit(self._txt(f"Reward: {self.last_reward:+.2f}", reward_color), (info_x, info_y + 130))
         
         pygame.display.flip()
-        self.clock.tick(2)
+        if self.fps:
+            self.clock.tick(self.fps)
     
     def close(self):
         if self.screen is not None:
-            pygame.quit()
+            _quit_pygame()
+            # The next render builds a new display and surfaces from the current fonts
+            self.screen = None
+            self._bg_surface = None
+            self._bg_dirty = True
+
+
+def _array_module(backend):
+    """NumPy-compatible array module for a vector env backend"""
+    if backend == 'numpy':
+        return np
+    if backend == 'cupy':
+        import cupy  # optional, only needed for GPU envs
+        return cupy
+    raise ValueError(f"Unknown backend {backend!r}, expected 'numpy' or 'cupy'")
+
+
+class VectorSimpleWarehouseEnv(gym.vector.VectorEnv):
+    """
+    N copies of SimpleWarehouseEnv stepped together with NumPy.
+    State is stored struct-of-arrays: one (N, 2) array per position, so a
+    batch of actions is processed with a handful of array ops instead of N
+    Python-level step calls. Finished rows are reset automatically.
+    
+    Same actions, observation and rewards as SimpleWarehouseEnv.
+    backend='cupy' keeps the state and all step math on the GPU.
+    """
+    
+    def __init__(self, num_envs=8, grid_size=5, backend='numpy'):
+        observation_space = spaces.Box(
+            low=0, high=grid_size,
+            shape=(7,), dtype=np.float32
+        )
+        super(VectorSimpleWarehouseEnv, self).__init__(
+            num_envs, observation_space, spaces.Discrete(6)
+        )
+        
+        # Positions are int16 grid cells; squared distances must fit in int16 too
+        if grid_size > 127:
+            raise ValueError(f"grid_size must be at most 127, got {grid_size}")
+        
+        self.grid_size = grid_size
+        self._max_coord = grid_size - 1  # Clamp bound for positions
+        self.backend = backend
+        self.xp = xp = _array_module(backend)
+        
+        # Struct-of-arrays state, one row per environment. Positions are kept
+        # as small ints and only converted to float32 in the observation.
+        self.agent = xp.zeros((num_envs, 2), dtype=np.int16)
+        self.pickup = xp.zeros((num_envs, 2), dtype=np.int16)
+        self.dest = xp.zeros((num_envs, 2), dtype=np.int16)
+        self.holding = xp.zeros(num_envs, dtype=bool)
+        self.step_count = xp.zeros(num_envs, dtype=np.int32)
+        
+        self._rng = xp.random.default_rng()
+        # Destination cell of every (action, cell) pair, clamp included, built
+        # from the same deltas the single env uses. Row action * G*G + y * G + x
+        # holds the (x, y) the agent ends up on, so a whole batch moves with
+        # one gather.
+        y, x = np.divmod(np.arange(grid_size * grid_size), grid_size)
+        moves = np.stack([
+            np.stack([np.clip(x + DX[a], 0, self._max_coord),
+                      np.clip(y + DY[a], 0, self._max_coord)], axis=1)
+            for a in range(len(DX))
+        ])
+        self._moves = xp.asarray(moves.reshape(-1, 2), dtype=np.int16)
+        self._actions = xp.zeros(num_envs, dtype=np.int64)
+        self._obs_buf = xp.empty((num_envs, 7), dtype=np.float32)
+    
+    def _reset_rows(self, idx):
+        """Sample new random positions for the environments in idx"""
+        xp = self.xp
+        n = len(idx)
+        cells = self.grid_size * self.grid_size
+        
+        # Agent, pickup and destination on three distinct cells without any
+        # rejection: draw from a range shrunk by the cells already taken,
+        # then step over those cells in increasing order
+        c0 = self._rng.integers(0, cells, size=n)
+        c1 = self._rng.integers(0, cells - 1, size=n)
+        c1 += c1 >= c0
+        lo, hi = xp.minimum(c0, c1), xp.maximum(c0, c1)
+        c2 = self._rng.integers(0, cells - 2, size=n)
+        c2 += c2 >= lo
+        c2 += c2 >= hi
+        
+        for pos, c in ((self.agent, c0), (self.pickup, c1), (self.dest, c2)):
+            pos[idx, 0] = c % self.grid_size
+            pos[idx, 1] = c // self.grid_size
+        
+        self.holding[idx] = False
+        self.step_count[idx] = 0
+        
+        # Full observation rows for the new episodes
+        b = self._obs_buf
+        b[idx, 0:2] = self.agent[idx]
+        b[idx, 2:4] = self.pickup[idx]
+        b[idx, 4:6] = self.dest[idx]
+        b[idx, 6] = False
+    
+    def _update_observation(self):
+        """
+        Refresh the observation buffer after a step, shape (N, 7). Only agent
+        position and holding change; _reset_rows writes the rest.
+        """
+        b = self._obs_buf
+        b[:, 0:2] = self.agent
+        b[:, 6] = self.holding
+        return b
+    
+    def reset_wait(self, seed=None, options=None):
+        if seed is not None:
+            self._rng = self.xp.random.default_rng(seed)
+        self._reset_rows(self.xp.arange(self.num_envs))
+        return self._obs_buf.copy(), {}
+    
+    def step_async(self, actions):
+        # int64 so the move-table row index cannot overflow the caller's dtype
+        self._actions = self.xp.asarray(actions, dtype=np.int64)
+    
+    def step_wait(self, **kwargs):
+        """Execute one action in every environment"""
+        xp = self.xp
+        actions = self._actions
+        self.step_count += 1
+        reward = xp.full(self.num_envs, -0.02)  # Penalty per step
+        
+        # Current target: the pickup until the item is held, then the destination.
+        # Squared distance BEFORE movement (sqrt is monotone, so the shaping
+        # threshold 1.5 becomes 2.25)
+        target = xp.where(self.holding[:, None], self.dest, self.pickup)
+        d = self.agent - target
+        old_d2 = xp.einsum('ij,ij->i', d, d)
+        
+        # Movement actions (0-3): one lookup in the move table; pickup/drop
+        # rows map every cell to itself
+        g = self.grid_size
+        xp.take(self._moves, (actions * g + self.agent[:, 1]) * g + self.agent[:, 0],
+                axis=0, out=self.agent)
+        on_target = (self.agent == target).all(1)
+        
+        # Pickup action
+        picked = (actions == PICKUP) & ~self.holding & on_target
+        reward += xp.where(picked, 50, 0)
+        
+        # Drop action
+        dropping = (actions == DROP) & self.holding
+        delivered = dropping & on_target
+        reward += xp.where(delivered, 300, xp.where(dropping, -10, 0))
+        
+        # Reward shaping towards the current target. A pickup switches the
+        # target to the destination without moving, so old and new distance
+        # are equal for those rows.
+        self.holding |= picked
+        target = xp.where(self.holding[:, None], self.dest, self.pickup)
+        d = self.agent - target
+        new_d2 = xp.einsum('ij,ij->i', d, d)
+        old_d2 = xp.where(picked, new_d2, old_d2)
+        reward += xp.where(new_d2 < old_d2, 2, xp.where(new_d2 < 2.25, 1, 0))
+        
+        terminated = delivered
+        truncated = self.step_count > 200
+        dones = terminated | truncated
+        
+        # Auto-reset finished rows; their last observation goes into the
+        # infos under the same keys gymnasium's own vector envs use
+        obs = self._update_observation()
+        infos = {}
+        if dones.any():
+            done_idx = xp.flatnonzero(dones)
+            final_obs = np.empty(self.num_envs, dtype=object)
+            final_info = np.empty(self.num_envs, dtype=object)
+            mask = np.zeros(self.num_envs, dtype=bool)
+            for i in done_idx.tolist():
+                final_obs[i] = obs[i].copy()
+                final_info[i] = {}
+                mask[i] = True
+            infos = {
+                'final_observation': final_obs, '_final_observation': mask,
+                'final_info': final_info, '_final_info': mask.copy(),
+            }
+            self._reset_rows(done_idx)  # Also rewrites their observation rows
+        
+        # One copy per step so returned batches are not overwritten later
+        return obs.copy(), reward, terminated, truncated, infos
+    
+    def close_extras(self, **kwargs):
+        pass
+
+
+class CudaWarehouseEnv(VectorSimpleWarehouseEnv):
+    """
+    VectorSimpleWarehouseEnv with its state on the GPU (CuPy by default).
+    Observations, rewards and dones are returned as device arrays, so a policy
+    that also runs on the GPU never copies them back to the host.
+    """
+    
+    def __init__(self, num_envs=4096, grid_size=5, backend='cupy'):
+        super(CudaWarehouseEnv, self).__init__(num_envs, grid_size, backend)
+
+
+def make_vec(n=8, mode='numpy', **kwargs):
+    """
+    Create n warehouse environments behind the gymnasium.vector API.
+    
+    mode='numpy' (default): VectorSimpleWarehouseEnv, all envs stepped in-process
+        with NumPy. Fastest for an env this cheap, where subprocess overhead dominates.
+    mode='async': one SimpleWarehouseEnv per subprocess (AsyncVectorEnv).
+    mode='sync': SimpleWarehouseEnv copies stepped in a loop (SyncVectorEnv).
+    """
+    if mode == 'numpy':
+        return VectorSimpleWarehouseEnv(num_envs=n, **kwargs)
+    
+    fns = [lambda: SimpleWarehouseEnv(**kwargs)] * n
+    if mode == 'async':
+        # fork is unsafe with the macOS system frameworks pygame loads
+        context = 'spawn' if sys.platform == 'darwin' else None
+        return gym.vector.AsyncVectorEnv(fns, context=context)
+    if mode == 'sync':
+        return gym.vector.SyncVectorEnv(fns)
+    raise ValueError(f"Unknown mode {mode!r}, expected 'numpy', 'async' or 'sync'")
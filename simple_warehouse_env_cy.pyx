@@ -0,0 +1,65 @@
+# cython: language_level=3
+"""
+Cython build of the SimpleWarehouseEnv step kernel.
+Build in place with: python setup.py build_ext --inplace
+"""
+
+from simple_warehouse_env import SimpleWarehouseEnv
+
+
+# Action ids
+cdef enum:
+    PICKUP = 4
+    DROP = 5
+
+# Grid delta per action: 0=up, 1=down, 2=left, 3=right, 4=pickup, 5=drop
+cdef int _DX[6]
+cdef int _DY[6]
+_DX[:] = [0, 0, -1, 1, 0, 0]
+_DY[:] = [-1, 1, 0, 0, 0, 0]
+
+
+cpdef tuple step_core(int ax, int ay, int px, int py, int dx, int dy,
+                      bint holding, int action, int grid_size):
+    """
+    Apply one action to a single environment, same logic as _step_kernel.step_core.
+    Returns (agent_x, agent_y, holding, reward, delivered).
+    """
+    cdef double reward
+    cdef bint on_target, picked, dropping, delivered, closer
+    cdef int tx, ty, old_d2, new_d2
+
+    # Current target: the pickup until the item is held, then the destination
+    tx = px + (dx - px) * holding
+    ty = py + (dy - py) * holding
+    old_d2 = (ax - tx) * (ax - tx) + (ay - ty) * (ay - ty)
+
+    # Movement: one table lookup plus a clamp (pickup/drop have a zero delta)
+    ax = min(grid_size - 1, max(0, ax + _DX[action]))
+    ay = min(grid_size - 1, max(0, ay + _DY[action]))
+    on_target = (ax == tx) & (ay == ty)
+
+    # Pickup / drop
+    picked = (action == PICKUP) & (not holding) & on_target
+    dropping = (action == DROP) & holding
+    delivered = dropping & on_target
+    reward = (-0.02  # Penalty per step
+              + 50.0 * picked  # Good reward for pickup
+              + 300.0 * delivered  # BIG reward for success!
+              - 10.0 * (dropping & (not delivered)))  # Penalty for wrong drop
+
+    # Reward shaping towards the current target; after a pickup old_d2 is 0
+    holding = holding | picked
+    tx = px + (dx - px) * holding
+    ty = py + (dy - py) * holding
+    new_d2 = (ax - tx) * (ax - tx) + (ay - ty) * (ay - ty)
+    closer = new_d2 < old_d2
+    reward += 2.0 * closer + (1 - closer) * (new_d2 < 2.25)
+
+    return ax, ay, holding, reward, delivered
+
+
+class CySimpleWarehouseEnv(SimpleWarehouseEnv):
+    """Drop-in SimpleWarehouseEnv whose step kernel is compiled with Cython"""
+
+    _step_core = staticmethod(step_core)
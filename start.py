@@ -1,39 +1,61 @@
 #!/usr/bin/env python
 """
 Warehouse Delivery RL - Agent learns to pick up and deliver items
-Run: python start.py
+Run: python start.py [--algo {ppo,dqn}] [--steps N] [--fps N]
 """
 
+import argparse
 import os
 import sys
 
+parser = argparse.ArgumentParser(description="Train and watch the warehouse delivery agent")
+parser.add_argument('--algo', choices=['ppo', 'dqn'], default='ppo',
+                    help="algorithm to train and load (default: ppo)")
+parser.add_argument('--steps', type=int, default=200000,
+                    help="training timesteps when no saved model exists (default: 200000)")
+parser.add_argument('--fps', type=int, default=None,
+                    help="frame-rate cap for the test episodes (default: the env's, 0 = uncapped)")
+args = parser.parse_args()
+
 print("\n" + "="*70)
 print("  Warehouse Delivery RL Agent".center(70))
 print("="*70 + "\n")
 
 try:
-    import numpy as np
-    import gym
-    import pygame
-    from stable_baselines3 import PPO
+    from stable_baselines3 import DQN, PPO
+    from stable_baselines3.common.env_util import make_vec_env
     from simple_warehouse_env import SimpleWarehouseEnv
     
-    # Check if model exists
-    model_path = "warehouse_delivery_agent.zip"
+    # One saved model per algorithm; PPO keeps the original file name
+    algo_cls = {'ppo': PPO, 'dqn': DQN}[args.algo]
+    model_path = ("warehouse_delivery_agent.zip" if args.algo == 'ppo'
+                  else f"warehouse_delivery_agent_{args.algo}.zip")
     
+    # Check if model exists
     if not os.path.exists(model_path):
-        print("Training new model (first time, ~90 seconds)...\n")
-        env = SimpleWarehouseEnv(grid_size=5, render_mode=None)
-        model = PPO('MlpPolicy', env, verbose=0, learning_rate=0.001, 
-                   n_steps=1024, batch_size=64, n_epochs=20, gamma=0.99,
-                   ent_coef=0.01)
-        model.learn(total_timesteps=200000)
+        print(f"Training new {args.algo.upper()} model ({args.steps} steps)...\n")
+        # 8 envs stepped in-process: a step is too cheap to pay for
+        # subprocess round-trips
+        env = make_vec_env(SimpleWarehouseEnv, n_envs=8,
+                           env_kwargs=dict(grid_size=5, render_mode=None))
+        if args.algo == 'ppo':
+            # n_steps is per env, so each update still sees 1024 transitions
+            model = PPO('MlpPolicy', env, verbose=0, learning_rate=0.001, 
+                       n_steps=128, batch_size=64, n_epochs=20, gamma=0.99,
+                       ent_coef=0.01)
+        else:
+            # train_freq counts vector steps: 8 transitions per update round
+            model = DQN('MlpPolicy', env, verbose=0, learning_rate=0.001,
+                        buffer_size=50000, learning_starts=1000, batch_size=64,
+                        gamma=0.99, train_freq=1, gradient_steps=2,
+                        target_update_interval=1000, exploration_fraction=0.3)
+        model.learn(total_timesteps=args.steps)
         model.save(model_path)
         env.close()
         print("✓ Model trained!\n")
     
     # Load model
-    model = PPO.load(model_path)
+    model = algo_cls.load(model_path)
     
     # Run test episodes
     print("Starting visual test (3 episodes)...")
@@ -41,22 +63,25 @@ try:
     print("="*70 + "\n")
     
     env = SimpleWarehouseEnv(grid_size=5, render_mode='human')
+    if args.fps is not None:
+        env.fps = args.fps
     
     successes = 0
     for episode in range(3):
         print(f"Episode {episode + 1}/3: ", end="", flush=True)
         
-        obs = env.reset()
+        obs, _ = env.reset()
         done = False
         steps = 0
         
         while not done:
             action, _ = model.predict(obs, deterministic=True)
             action = int(action)
-            obs, reward, done, _ = env.step(action)
+            obs, reward, terminated, truncated, _ = env.step(action)
+            done = terminated or truncated
             steps += 1
         
-        if steps < 50:
+        if terminated:
             print(f"✓ SUCCESS ({steps} steps)")
             successes += 1
         else:
@@ -0,0 +1,103 @@
+"""
+Randomized parity check: every step backend must agree with the scalar
+kernel _step_kernel.step_core on positions, holding, reward and termination.
+The JAX and Cython backends are skipped when not installed / not built.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _step_kernel import step_core
+from simple_warehouse_env import VectorSimpleWarehouseEnv
+
+N = 4096
+
+
+def _random_states(grid_size, seed):
+    """N random states; cells may coincide so edge cases are covered too"""
+    rng = np.random.default_rng(seed)
+    pos = rng.integers(0, grid_size, size=(N, 6))
+    holding = rng.random(N) < 0.5
+    actions = rng.integers(0, 6, size=N)
+    return pos, holding, actions
+
+
+def _reference(pos, holding, actions, grid_size):
+    """(agent (N, 2), holding, reward, delivered) from the scalar kernel"""
+    out = [step_core(*map(int, p), bool(h), int(a), grid_size)
+           for p, h, a in zip(pos, holding, actions)]
+    ax, ay, held, reward, delivered = (np.array(col) for col in zip(*out))
+    return np.stack([ax, ay], axis=1), held.astype(bool), reward, delivered.astype(bool)
+
+
+@pytest.mark.parametrize('grid_size', [5, 8])
+def test_vector_env_matches_kernel(grid_size):
+    pos, holding, actions = _random_states(grid_size, seed=grid_size)
+    agent, held, reward, delivered = _reference(pos, holding, actions, grid_size)
+
+    env = VectorSimpleWarehouseEnv(num_envs=N, grid_size=grid_size)
+    env.reset(seed=0)
+    env.agent[:] = pos[:, 0:2]
+    env.pickup[:] = pos[:, 2:4]
+    env.dest[:] = pos[:, 4:6]
+    env.holding[:] = holding
+    obs, rew, terminated, truncated, infos = env.step(actions)
+
+    np.testing.assert_allclose(rew, reward, atol=1e-9)
+    np.testing.assert_array_equal(terminated, delivered)
+    assert not truncated.any()
+    # Delivered rows were auto-reset; their last observation is in the infos
+    last = obs.copy()
+    for i in np.flatnonzero(terminated):
+        last[i] = infos['final_observation'][i]
+    np.testing.assert_array_equal(last[:, 0:2], agent)
+    np.testing.assert_array_equal(last[:, 6].astype(bool), held)
+
+
+@pytest.mark.parametrize('grid_size', [5, 8])
+def test_jax_step_matches_kernel(grid_size):
+    jax = pytest.importorskip('jax')
+    jnp = jax.numpy
+    from jax_warehouse_env import EnvState, step
+
+    pos, holding, actions = _random_states(grid_size, seed=100 + grid_size)
+    agent, held, reward, delivered = _reference(pos, holding, actions, grid_size)
+
+    state = EnvState(
+        agent=jnp.asarray(pos[:, 0:2], dtype=jnp.int32),
+        pickup=jnp.asarray(pos[:, 2:4], dtype=jnp.int32),
+        dest=jnp.asarray(pos[:, 4:6], dtype=jnp.int32),
+        holding=jnp.asarray(holding),
+        step=jnp.zeros(N, dtype=jnp.int32),
+    )
+    state, obs, rew, terminated, truncated = jax.vmap(
+        lambda s, a: step(s, a, grid_size)
+    )(state, jnp.asarray(actions))
+
+    np.testing.assert_allclose(np.asarray(rew), reward, atol=1e-5)
+    np.testing.assert_array_equal(np.asarray(terminated), delivered)
+    np.testing.assert_array_equal(np.asarray(state.agent), agent)
+    np.testing.assert_array_equal(np.asarray(state.holding), held)
+
+
+@pytest.mark.parametrize('grid_size', [5, 8])
+def test_cython_step_matches_kernel(grid_size):
+    cy = pytest.importorskip('simple_warehouse_env_cy',
+                             reason="build with: python setup.py build_ext --inplace")
+
+    pos, holding, actions = _random_states(grid_size, seed=200 + grid_size)
+    agent, held, reward, delivered = _reference(pos, holding, actions, grid_size)
+
+    out = [cy.step_core(*map(int, p), bool(h), int(a), grid_size)
+           for p, h, a in zip(pos, holding, actions)]
+    ax, ay, cy_held, cy_reward, cy_delivered = (np.array(col) for col in zip(*out))
+
+    np.testing.assert_allclose(cy_reward, reward, atol=1e-9)
+    np.testing.assert_array_equal(cy_delivered.astype(bool), delivered)
+    np.testing.assert_array_equal(np.stack([ax, ay], axis=1), agent)
+    np.testing.assert_array_equal(cy_held.astype(bool), held)
@@ -0,0 +1,64 @@
+"""
+Shortest-path oracle for SimpleWarehouseEnv.
+
+BFS first-move tables are computed once per goal cell, so choosing the
+expert action is a single table lookup per env. Useful as a scripted
+baseline and as a teacher for demonstrations.
+
+    oracle = WarehouseOracle(grid_size=5)
+    action = oracle.act(obs)        # obs of shape (7,) or a batch (N, 7)
+"""
+
+from collections import deque
+
+import numpy as np
+
+from _step_kernel import DX, DY, PICKUP, DROP
+
+
+def first_move_table(grid_size, goal):
+    """
+    (grid_size, grid_size) int8 table indexed [y, x]: the first move of a
+    shortest path from (x, y) to goal = (gx, gy), -1 at the goal itself.
+    The grid has no walls, so every other cell gets a move.
+    """
+    table = np.full((grid_size, grid_size), -1, dtype=np.int8)
+    seen = np.zeros((grid_size, grid_size), dtype=bool)
+    gx, gy = goal
+    seen[gy, gx] = True
+    queue = deque([(gx, gy)])
+
+    # Search backwards from the goal: the cell that reaches (cx, cy) with
+    # action a is (cx - DX[a], cy - DY[a]), and a is its first move
+    while queue:
+        cx, cy = queue.popleft()
+        for a in range(PICKUP):
+            nx, ny = cx - DX[a], cy - DY[a]
+            if 0 <= nx < grid_size and 0 <= ny < grid_size and not seen[ny, nx]:
+                seen[ny, nx] = True
+                table[ny, nx] = a
+                queue.append((nx, ny))
+    return table
+
+
+class WarehouseOracle:
+    """Expert policy: walk a shortest path to the pickup, pick up, walk to the destination, drop"""
+
+    def __init__(self, grid_size=5):
+        self.grid_size = grid_size
+        # One first-move table per goal cell, indexed [gy * G + gx, y, x]
+        self._tables = np.stack([
+            first_move_table(grid_size, (g % grid_size, g // grid_size))
+            for g in range(grid_size * grid_size)
+        ])
+
+    def act(self, obs):
+        """Expert action for one observation (returns an int) or a batch (returns an array)"""
+        o = np.asarray(obs).astype(np.intp)
+        holding = o[..., 6].astype(bool)
+        tx = np.where(holding, o[..., 4], o[..., 2])
+        ty = np.where(holding, o[..., 5], o[..., 3])
+        action = self._tables[ty * self.grid_size + tx, o[..., 1], o[..., 0]]
+        # On the target: pick up or drop instead of moving
+        action = np.where(action < 0, np.where(holding, DROP, PICKUP), action)
+        return int(action) if action.ndim == 0 else action